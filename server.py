@@ -17,18 +17,30 @@ Environment Variables:
   QJ_MCP_PASSWORD   - Your QuantJourney password
   QJ_MCP_API_KEY    - API key (alternative to email/password)
   QJ_MCP_BASE_URL   - API URL (default: https://api.quantjourney.cloud)
+  QJ_MCP_TOOLS_TTL  - Seconds between tool manifest revalidations (default: 600)
+  QJ_MCP_PRETTY     - Set to 1 to pretty-print tool results (debugging)
+  QJ_MCP_MAX_FRAME  - Max inbound message size in bytes (default: 1048576)
+  QJ_MCP_WORKERS    - Concurrent tool-call workers (default: 8)
 """
 from __future__ import annotations
 
+import atexit
+import base64
+import gzip
+import io
 import json
 import logging
 import os
+import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
 # Load .env file if present
 try:
@@ -37,6 +49,25 @@ try:
 except ImportError:
     pass
 
+# Use orjson when available — C-accelerated and emits UTF-8 bytes directly
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Use httpx for HTTP/2 multiplexing when available (see _http_post below)
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+# Use zstandard for tool-result compression when the client negotiates it
+# (see handle_initialize); gzip from the stdlib is the fallback codec
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
 # Configure logging to stderr (stdout is reserved for MCP protocol)
 logging.basicConfig(
     level=logging.INFO,
@@ -49,10 +80,103 @@ logger = logging.getLogger("qj-mcp")
 # Configuration
 # ---------------------------------------------------------------------------
 
-BASE_URL = os.getenv("QJ_MCP_BASE_URL", "https://api.quantjourney.cloud").rstrip("/")
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Server configuration — read from the environment once at import."""
+
+    base_url: str
+    api_key: str
+    bearer: str
+    email: str
+    password: str
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        return cls(
+            base_url=os.getenv("QJ_MCP_BASE_URL", "https://api.quantjourney.cloud").rstrip("/"),
+            api_key=os.getenv("QJ_MCP_API_KEY", "").strip(),
+            bearer=os.getenv("QJ_MCP_BEARER", "").strip(),
+            email=os.getenv("QJ_MCP_EMAIL", "").strip(),
+            password=os.getenv("QJ_MCP_PASSWORD", "").strip(),
+        )
+
+
+_CFG = Config.from_env()
+BASE_URL = _CFG.base_url
+
+# One pooled session for all API traffic — urllib3 keeps the TCP/TLS
+# connection to the API alive between calls instead of re-handshaking.
+# Pool sizing matches the tool-call worker pool; transient gateway errors
+# retry twice with a short backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+))
+_SESSION.headers.update({"Content-Type": "application/json"})
+
+# With httpx[http2] installed, concurrent tool calls multiplex over a single
+# TLS connection (ALPN-negotiated; falls back to h1 if the API declines).
+_CLIENT = None
+if httpx is not None:
+    try:
+        _CLIENT = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        )
+        atexit.register(_CLIENT.close)
+    except ImportError:
+        # httpx present but the h2 extra isn't — stay on the requests session
+        _CLIENT = None
+
+# Exception types that carry an HTTP status from either transport
+_HTTP_ERRORS = (requests.HTTPError, httpx.HTTPStatusError) if _CLIENT is not None else (requests.HTTPError,)
+
+
+def _http_post(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: int) -> Any:
+    """POST JSON via the HTTP/2 client when available, else the pooled session."""
+    if _CLIENT is not None:
+        return _CLIENT.post(url, json=payload, headers=headers, timeout=timeout)
+    return _SESSION.post(url, json=payload, headers=headers, timeout=timeout)
+
+
+def _http_get(url: str, headers: Dict[str, str], timeout: int) -> Any:
+    """GET via the HTTP/2 client when available, else the pooled session."""
+    if _CLIENT is not None:
+        return _CLIENT.get(url, headers=headers, timeout=timeout)
+    return _SESSION.get(url, headers=headers, timeout=timeout)
+
+
+# ---------------------------------------------------------------------------
+# JSON helpers — orjson on hot paths when installed, stdlib fallback
+# ---------------------------------------------------------------------------
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 
-@dataclass
+def _json_dumps_pretty(obj: Any) -> str:
+    """Serialize to 2-space-indented JSON text (tool results shown to the model)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
+@dataclass(frozen=True, slots=True)
 class Tool:
     name: str
     description: str
@@ -68,42 +192,80 @@ _AUTH_TOKEN: Optional[str] = None
 _REFRESH_TOKEN: Optional[str] = None
 _TOKEN_EXPIRY: int = 0  # Unix timestamp
 
+# Safety margin around token expiry: deducted when recording a token's
+# lifetime and again when deciding whether it is still safe to send
+_EXPIRY_SKEW_SECS = 60
+
+# Count of _ensure_auth calls satisfied by the cached token (observability)
+_AUTH_CACHE_HITS = 0
+
+# Single-flight guard: only one thread talks to /auth/* at a time
+_AUTH_LOCK = threading.Lock()
+
+# Auth header, resolved once whenever a token is set (scheme probing is
+# done at set time, not per call)
+_AUTH_HEADER_NAME: Optional[str] = None
+_AUTH_HEADER_VALUE: Optional[str] = None
+
+
+def _set_auth_header(token: str) -> None:
+    """Record which header carries this token and its full value."""
+    global _AUTH_HEADER_NAME, _AUTH_HEADER_VALUE
+    if token.startswith("QJ_"):
+        # API keys are sent as-is; JWT tokens need the Bearer prefix
+        _AUTH_HEADER_NAME, _AUTH_HEADER_VALUE = "X-API-Key", token
+    elif token.startswith("Bearer "):
+        _AUTH_HEADER_NAME, _AUTH_HEADER_VALUE = "Authorization", token
+    else:
+        _AUTH_HEADER_NAME, _AUTH_HEADER_VALUE = "Authorization", f"Bearer {token}"
+
+
+def _jwt_expiry(token: str) -> Optional[int]:
+    """Read the exp claim from a JWT without verifying it (local expiry scheduling only)."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)  # restore stripped base64 padding
+        claims = _json_loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return int(exp) if exp else None
+    except Exception:
+        return None
+
 
 def _authenticate() -> Optional[str]:
     """Authenticate with QuantJourney API and return bearer token."""
     global _AUTH_TOKEN, _REFRESH_TOKEN, _TOKEN_EXPIRY
 
     # 1) API key — no refresh needed, long-lived
-    api_key = os.getenv("QJ_MCP_API_KEY", "").strip()
-    if api_key:
-        _AUTH_TOKEN = api_key
+    if _CFG.api_key:
+        _AUTH_TOKEN = _CFG.api_key
         _TOKEN_EXPIRY = int(time.time()) + 86400 * 365  # effectively permanent
+        _set_auth_header(_AUTH_TOKEN)
         logger.info("Using API key authentication")
         return _AUTH_TOKEN
 
-    # 2) Raw bearer token
-    bearer = os.getenv("QJ_MCP_BEARER", "").strip()
-    if bearer:
-        _AUTH_TOKEN = bearer
-        _TOKEN_EXPIRY = int(time.time()) + 900  # assume 15 min
+    # 2) Raw bearer token — no refresh thread: there is no refresh token, so
+    # once the env-supplied bearer expires there is nothing we can renew
+    if _CFG.bearer:
+        _AUTH_TOKEN = _CFG.bearer
+        # Prefer the token's own exp claim; assume 15 min if unreadable
+        _TOKEN_EXPIRY = _jwt_expiry(_CFG.bearer) or int(time.time()) + 900
+        _set_auth_header(_AUTH_TOKEN)
         logger.info("Using bearer token from environment")
         return _AUTH_TOKEN
 
     # 3) Email / password login
-    email = os.getenv("QJ_MCP_EMAIL", "").strip()
-    password = os.getenv("QJ_MCP_PASSWORD", "").strip()
-
-    if not (email and password):
+    if not (_CFG.email and _CFG.password):
         logger.warning("No credentials. Set QJ_MCP_EMAIL/QJ_MCP_PASSWORD or QJ_MCP_API_KEY")
         return None
 
-    logger.info("Authenticating as %s ...", email)
+    logger.info("Authenticating as %s ...", _CFG.email)
     try:
-        resp = requests.post(
+        resp = _http_post(
             f"{BASE_URL}/auth/login",
-            json={"email": email, "password": password},
-            headers={"Content-Type": "application/json"},
-            timeout=30,
+            {"email": _CFG.email, "password": _CFG.password},
+            {"Content-Type": "application/json"},
+            30,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -114,8 +276,11 @@ def _authenticate() -> Optional[str]:
         if token:
             _AUTH_TOKEN = token
             _REFRESH_TOKEN = refresh
-            _TOKEN_EXPIRY = int(time.time()) + expires_in - 60  # 60s buffer
+            _TOKEN_EXPIRY = int(time.time()) + expires_in - _EXPIRY_SKEW_SECS
+            _set_auth_header(token)
             logger.info("Authenticated (expires in %ds)", expires_in)
+            _save_auth_state()
+            _start_refresh_thread()
             return token
         else:
             logger.error("No token in login response")
@@ -135,11 +300,11 @@ def _refresh_auth() -> Optional[str]:
 
     logger.info("Refreshing token ...")
     try:
-        resp = requests.post(
+        resp = _http_post(
             f"{BASE_URL}/auth/refresh",
-            json={"refresh_token": _REFRESH_TOKEN},
-            headers={"Content-Type": "application/json"},
-            timeout=30,
+            {"refresh_token": _REFRESH_TOKEN},
+            {"Content-Type": "application/json"},
+            30,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -151,8 +316,10 @@ def _refresh_auth() -> Optional[str]:
             _AUTH_TOKEN = token
             if refresh:
                 _REFRESH_TOKEN = refresh
-            _TOKEN_EXPIRY = int(time.time()) + expires_in - 60
+            _TOKEN_EXPIRY = int(time.time()) + expires_in - _EXPIRY_SKEW_SECS
+            _set_auth_header(token)
             logger.info("Token refreshed (expires in %ds)", expires_in)
+            _save_auth_state()
             return token
         else:
             logger.warning("Refresh failed — re-authenticating")
@@ -163,35 +330,213 @@ def _refresh_auth() -> Optional[str]:
 
 
 def _ensure_auth() -> str:
-    """Ensure we have a valid token — refresh if expired."""
-    global _AUTH_TOKEN, _TOKEN_EXPIRY
+    """Ensure we have a valid token — refresh ahead of expiry, not after it."""
+    global _AUTH_TOKEN, _TOKEN_EXPIRY, _AUTH_CACHE_HITS
 
     now = int(time.time())
 
-    # Still valid
-    if _AUTH_TOKEN and _TOKEN_EXPIRY > now:
+    # Still comfortably valid — refresh early rather than risk sending a
+    # token that expires mid-flight (which costs a 401 + retry round trip)
+    if _AUTH_TOKEN and _TOKEN_EXPIRY > now + _EXPIRY_SKEW_SECS:
+        _AUTH_CACHE_HITS += 1
+        logger.debug("Token cache hit (%d total)", _AUTH_CACHE_HITS)
         return _AUTH_TOKEN
 
-    # Expired — try refresh
-    if _AUTH_TOKEN and _REFRESH_TOKEN:
-        token = _refresh_auth()
-        if token:
-            return token
+    # Stale — single-flight: one thread refreshes, the rest wait here and
+    # pick up its result on the re-check (double-checked locking)
+    with _AUTH_LOCK:
+        now = int(time.time())
+        if _AUTH_TOKEN and _TOKEN_EXPIRY > now + _EXPIRY_SKEW_SECS:
+            return _AUTH_TOKEN
+
+        # Expired — try refresh
+        if _AUTH_TOKEN and _REFRESH_TOKEN:
+            token = _refresh_auth()
+            if token:
+                return token
+
+        # Fresh login
+        token = _authenticate()
+        return token or ""
+
+
+_STATE_FILE_NAME = "state.json"  # lives in _CACHE_DIR next to the manifest cache
+
+
+def _auth_state_file() -> str:
+    return os.path.join(_CACHE_DIR, _STATE_FILE_NAME)
+
+
+def _load_auth_state() -> bool:
+    """Restore persisted tokens if still comfortably valid (cold-start fast path)."""
+    global _AUTH_TOKEN, _REFRESH_TOKEN, _TOKEN_EXPIRY
+    try:
+        with open(_auth_state_file(), "rb") as f:
+            state = _json_loads(f.read())
+        token = state.get("auth_token") or None
+        expiry = int(state.get("token_expiry", 0))
+        if token and expiry > time.time() + _EXPIRY_SKEW_SECS:
+            _AUTH_TOKEN = token
+            _REFRESH_TOKEN = state.get("refresh_token") or None
+            _TOKEN_EXPIRY = expiry
+            _set_auth_header(token)
+            _start_refresh_thread()
+            logger.info("Restored auth state from cache (expires in %ds)", int(expiry - time.time()))
+            return True
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.debug("Ignoring unreadable auth state: %s", exc)
+    return False
+
+
+def _save_auth_state() -> None:
+    """Persist tokens so a restart skips the login round trip (0600, atomic)."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        tmp = _auth_state_file() + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_json_dumps({
+                "auth_token": _AUTH_TOKEN,
+                "refresh_token": _REFRESH_TOKEN,
+                "token_expiry": _TOKEN_EXPIRY,
+            }))
+        os.replace(tmp, _auth_state_file())
+    except Exception as exc:
+        logger.debug("Could not write auth state: %s", exc)
+
+
+def _clear_auth_state() -> None:
+    """Drop persisted tokens (e.g. after the API rejects one)."""
+    try:
+        os.remove(_auth_state_file())
+    except OSError:
+        pass
+
+
+def _invalidate_auth() -> None:
+    """Discard a server-rejected token, in memory and on disk.
 
-    # Fresh login
-    token = _authenticate()
-    return token or ""
+    A 401 can arrive while the token still looks locally valid (revocation,
+    clock skew beyond the expiry buffer); zeroing the expiry forces the next
+    _ensure_auth to refresh or re-login instead of serving the same token.
+    """
+    global _TOKEN_EXPIRY
+    _TOKEN_EXPIRY = 0
+    _clear_auth_state()
+
+
+_REFRESH_THREAD_STARTED = False
+
+
+def _start_refresh_thread() -> None:
+    """Start the background token refresher (once per process)."""
+    global _REFRESH_THREAD_STARTED
+    if _REFRESH_THREAD_STARTED:
+        return
+    _REFRESH_THREAD_STARTED = True
+    threading.Thread(target=_refresh_loop, name="qj-auth-refresh", daemon=True).start()
+
+
+def _refresh_loop() -> None:
+    """Refresh the token shortly before expiry so tool calls never hit a 401 window."""
+    while True:
+        wait = _TOKEN_EXPIRY - time.time() - _EXPIRY_SKEW_SECS
+        if wait > 0:
+            # Re-check periodically — expiry moves when anything else refreshes
+            time.sleep(min(wait, 300))
+            continue
+        logger.info("Token near expiry — refreshing in background")
+        _ensure_auth()  # single-flight with any concurrent caller
+        if _TOKEN_EXPIRY - time.time() - _EXPIRY_SKEW_SECS <= 0:
+            # Refresh failed, or re-auth handed back a token that is already
+            # past expiry (e.g. a stale env bearer) — back off, don't spin
+            time.sleep(60)
 
 
 # ---------------------------------------------------------------------------
-# Tool Loading — from API manifest
+# Tool Loading — from API manifest, with an ETag-validated disk cache
 # ---------------------------------------------------------------------------
 
 _TOOLS: Optional[Dict[str, Tool]] = None
+_TOOLS_LOADED_AT: float = 0.0  # monotonic-ish wall clock of last successful load
+_TOOLS_TTL = int(os.getenv("QJ_MCP_TOOLS_TTL", "600"))  # seconds between refreshes
+
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qj-mcp")
+_MANIFEST_CACHE_FILE = os.path.join(_CACHE_DIR, "tools.json")
+
+
+def _load_manifest_cache() -> Optional[Dict[str, Any]]:
+    """Load the cached manifest envelope {etag, last_modified, manifest} from disk."""
+    try:
+        with open(_MANIFEST_CACHE_FILE, "rb") as f:
+            cached = json.load(f)
+        if isinstance(cached, dict) and "manifest" in cached:
+            return cached
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.debug("Ignoring unreadable manifest cache: %s", exc)
+    return None
+
+
+def _save_manifest_cache(manifest: Dict[str, Any], etag: str, last_modified: str) -> None:
+    """Persist the manifest + validators to disk (atomic replace, best effort)."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        tmp = _MANIFEST_CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": last_modified, "manifest": manifest}, f)
+        os.replace(tmp, _MANIFEST_CACHE_FILE)
+    except Exception as exc:
+        logger.debug("Could not write manifest cache: %s", exc)
+
+
+def _parse_manifest(data: Dict[str, Any]) -> Dict[str, Tool]:
+    """Build the Tool table from a raw manifest payload."""
+    tools: Dict[str, Tool] = {}
+    for t in data.get("tools", []):
+        name = t.get("name")
+        if not name:
+            continue
+
+        desc = (
+            t.get("description_short")
+            or t.get("description_long")
+            or t.get("description")
+            or name
+        )
+        schema = (
+            t.get("input_schema")
+            or t.get("inputSchema")
+            or {"type": "object", "properties": {}}
+        )
+
+        exec_spec = t.get("execution") or {}
+        endpoint = (
+            exec_spec.get("preferred")
+            or exec_spec.get("fallback")
+            or t.get("endpoint")
+            or f"/mcp/call/{name}"
+        )
+
+        tools[name] = Tool(
+            name=name,
+            description=desc,
+            input_schema=schema,
+            # Full URL, concatenated once here instead of on every call
+            endpoint=f"{BASE_URL}{endpoint}",
+        )
+    return tools
 
 
 def _load_tools_from_api() -> Dict[str, Tool]:
-    """Fetch available tools from the QuantJourney API manifest endpoint."""
+    """Fetch available tools from the QuantJourney API manifest endpoint.
+
+    Sends If-None-Match / If-Modified-Since when a cached copy exists, so an
+    unchanged manifest costs a header-only 304 instead of a full download.
+    """
     tools: Dict[str, Tool] = {}
 
     token = _ensure_auth()
@@ -199,68 +544,80 @@ def _load_tools_from_api() -> Dict[str, Tool]:
         logger.warning("Cannot load tools — not authenticated")
         return tools
 
-    headers: Dict[str, str] = {"Content-Type": "application/json"}
-    # API keys are sent as-is; JWT tokens need Bearer prefix
-    if token.startswith("QJ_"):
-        headers["X-API-Key"] = token
-    else:
-        headers["Authorization"] = f"Bearer {token}" if not token.startswith("Bearer ") else token
+    # Copy the shared header dict — conditional validators are added below
+    headers = dict(_get_headers())
+
+    cached = _load_manifest_cache()
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
 
     try:
-        resp = requests.get(
-            f"{BASE_URL}/mcp/manifest",
-            headers=headers,
-            timeout=30,
-        )
+        resp = _http_get(f"{BASE_URL}/mcp/manifest", headers, 30)
+        if resp.status_code == 304 and cached:
+            logger.info("Manifest unchanged (304) — using cached copy")
+            return _parse_manifest(cached["manifest"])
+
         resp.raise_for_status()
         data = resp.json()
-
-        for t in data.get("tools", []):
-            name = t.get("name")
-            if not name:
-                continue
-
-            desc = (
-                t.get("description_short")
-                or t.get("description_long")
-                or t.get("description")
-                or name
-            )
-            schema = (
-                t.get("input_schema")
-                or t.get("inputSchema")
-                or {"type": "object", "properties": {}}
-            )
-
-            exec_spec = t.get("execution") or {}
-            endpoint = (
-                exec_spec.get("preferred")
-                or exec_spec.get("fallback")
-                or t.get("endpoint")
-                or f"/mcp/call/{name}"
-            )
-
-            tools[name] = Tool(
-                name=name,
-                description=desc,
-                input_schema=schema,
-                endpoint=endpoint,
-            )
-
+        tools = _parse_manifest(data)
+        _save_manifest_cache(
+            data,
+            resp.headers.get("ETag", ""),
+            resp.headers.get("Last-Modified", ""),
+        )
         logger.info("Loaded %d tools from API", len(tools))
     except Exception as exc:
         logger.error("Failed to load tools: %s", exc)
+        if cached:
+            logger.info("Falling back to cached manifest")
+            return _parse_manifest(cached["manifest"])
 
     return tools
 
 
+def _install_tools(tools: Dict[str, Tool]) -> None:
+    """Swap in a new tool table and rebuild the caches derived from it."""
+    global _TOOLS, _TOOL_NAME_MAP, _TOOLS_LIST_CACHE
+    _TOOLS = tools
+    _TOOL_NAME_MAP = {_sanitize_tool_name(name): name for name in tools}
+    _TOOLS_LIST_CACHE = None
+
+
+# Single-flight guard: the startup prefetch thread and handle_tools_list can
+# race into the first load — whoever loses the lock reuses the winner's result
+_TOOLS_LOCK = threading.Lock()
+
+
 def _get_tools() -> Dict[str, Tool]:
-    """Lazy-load tools on first access."""
-    global _TOOLS
-    if _TOOLS is None:
-        logger.info("Loading tools ...")
-        _TOOLS = _load_tools_from_api()
-    return _TOOLS
+    """Lazy-load tools on first access; revalidate after QJ_MCP_TOOLS_TTL seconds."""
+    global _TOOLS_LOADED_AT
+    if _TOOLS is not None and time.time() - _TOOLS_LOADED_AT <= _TOOLS_TTL:
+        return _TOOLS
+    with _TOOLS_LOCK:
+        now = time.time()
+        if _TOOLS is None:
+            logger.info("Loading tools ...")
+            _install_tools(_load_tools_from_api())
+            _TOOLS_LOADED_AT = now
+        elif now - _TOOLS_LOADED_AT > _TOOLS_TTL:
+            logger.info("Tool manifest older than %ds — revalidating", _TOOLS_TTL)
+            fresh = _load_tools_from_api()
+            if fresh:
+                _install_tools(fresh)
+            _TOOLS_LOADED_AT = now
+        return _TOOLS
+
+
+def _prefetch_tools() -> None:
+    """Warm auth + manifest in the background; errors stay lazy-load's problem."""
+    try:
+        _get_tools()
+    except Exception as e:
+        # First tools/list will retry on the request path as before
+        logger.debug("Tool prefetch failed (will load lazily): %s", e)
 
 
 def _reload_tools() -> Dict[str, Tool]:
@@ -274,6 +631,8 @@ def _reload_tools() -> Dict[str, Tool]:
 # Tool Name Sanitization (. → _ for MCP compatibility)
 # ---------------------------------------------------------------------------
 
+# Reverse mapping sanitized_name → original_name; rebuilt by _install_tools
+# whenever a manifest is swapped in, so lookups are always a plain .get
 _TOOL_NAME_MAP: Dict[str, str] = {}
 
 
@@ -282,22 +641,11 @@ def _sanitize_tool_name(name: str) -> str:
     return name.replace(".", "_")
 
 
-def _build_tool_name_map() -> Dict[str, str]:
-    """Build reverse mapping: sanitized_name → original_name."""
-    global _TOOL_NAME_MAP
-    if not _TOOL_NAME_MAP:
-        for original in _get_tools():
-            _TOOL_NAME_MAP[_sanitize_tool_name(original)] = original
-    return _TOOL_NAME_MAP
-
-
-def _unsanitize_tool_name(name: str) -> str:
+def _unsanitize_tool_name(name: str, tools: Dict[str, Tool]) -> str:
     """Resolve MCP tool name back to original API name."""
-    tools = _get_tools()
     if name in tools:
         return name
-    name_map = _build_tool_name_map()
-    return name_map.get(name, name)
+    return _TOOL_NAME_MAP.get(name, name)
 
 
 # ---------------------------------------------------------------------------
@@ -316,73 +664,158 @@ def _error(id_val: Any, code: int, message: str, data: Any = None) -> Dict[str,
     return {"jsonrpc": "2.0", "id": id_val, "error": err}
 
 
+# Invariant parts of the initialize response — built once, shared by reference
+_SERVER_INFO = {"name": "QuantJourney MCP Server", "version": "1.1.0"}
+_CAPABILITIES: Dict[str, Any] = {"tools": {}}
+
+
+# Result compression, negotiated at initialize: the codec name ("zstd" or
+# "gzip") once agreed, else None. Only bodies above the threshold are worth
+# the base64 round trip — small ones would grow instead.
+_COMPRESSION: Optional[str] = None
+_COMPRESS_MIN_BYTES = 4096
+
+
+def _negotiate_compression(params: Optional[Dict]) -> Optional[str]:
+    """Pick a result codec from the client's qj_compression capability, if any."""
+    offered = ((params or {}).get("capabilities") or {}).get("qj_compression")
+    if isinstance(offered, str):
+        offered = [offered]
+    if not isinstance(offered, list):
+        return None  # absent or malformed (e.g. true, a number) — stay plain
+    if zstandard is not None and "zstd" in offered:
+        return "zstd"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
 def handle_initialize(id_val: Any, params: Optional[Dict]) -> Dict[str, Any]:
+    global _COMPRESSION
     protocol_version = (params or {}).get("protocolVersion", "2024-11-05")
+    capabilities = _CAPABILITIES
+    _COMPRESSION = _negotiate_compression(params)
+    if _COMPRESSION:
+        logger.info("Client negotiated %s result compression", _COMPRESSION)
+        capabilities = dict(_CAPABILITIES)
+        capabilities["qj_compression"] = _COMPRESSION
     return _result(id_val, {
         "protocolVersion": protocol_version,
-        "serverInfo": {"name": "QuantJourney MCP Server", "version": "1.1.0"},
-        "capabilities": {
-            "tools": {},
-        },
+        "serverInfo": _SERVER_INFO,
+        "capabilities": capabilities,
     })
 
 
+_TOOLS_LIST_CACHE: Optional[List[Dict[str, Any]]] = None
+
+
+def _tools_list_payload() -> List[Dict[str, Any]]:
+    """Sanitized tools/list items — built once per manifest load, then reused."""
+    global _TOOLS_LIST_CACHE
+    if _TOOLS_LIST_CACHE is None:
+        _TOOLS_LIST_CACHE = [
+            {
+                "name": _sanitize_tool_name(t.name),
+                "description": t.description,
+                "inputSchema": t.input_schema or {"type": "object", "properties": {}},
+            }
+            for t in _get_tools().values()
+        ]
+    return _TOOLS_LIST_CACHE
+
+
 def handle_tools_list(id_val: Any, params: Optional[Dict]) -> Dict[str, Any]:
-    items = []
-    for t in _get_tools().values():
-        items.append({
-            "name": _sanitize_tool_name(t.name),
-            "description": t.description,
-            "inputSchema": t.input_schema or {"type": "object", "properties": {}},
-        })
-    return _result(id_val, {"tools": items})
+    return _result(id_val, {"tools": _tools_list_payload()})
+
+
+_HEADERS_CACHE: Dict[str, str] = {}
+_HEADERS_TOKEN: Optional[str] = None
 
 
 def _get_headers() -> Dict[str, str]:
-    """Build HTTP headers for API calls with valid auth."""
+    """HTTP headers for API calls with valid auth — rebuilt only when the token changes.
+
+    Callers must treat the returned dict as read-only; it is shared.
+    """
+    global _HEADERS_CACHE, _HEADERS_TOKEN
     token = _ensure_auth()
-    headers: Dict[str, str] = {"Content-Type": "application/json"}
-    if token:
-        if token.startswith("QJ_"):
-            headers["X-API-Key"] = token
-        else:
-            headers["Authorization"] = f"Bearer {token}" if not token.startswith("Bearer ") else token
-    return headers
+    if token != _HEADERS_TOKEN:
+        headers: Dict[str, str] = {"Content-Type": "application/json"}
+        if token and _AUTH_HEADER_NAME and _AUTH_HEADER_VALUE:
+            headers[_AUTH_HEADER_NAME] = _AUTH_HEADER_VALUE
+        _HEADERS_CACHE = headers
+        _HEADERS_TOKEN = token
+    return _HEADERS_CACHE
+
+
+def _call_api(url: str, args: Dict[str, Any], headers: Dict[str, str]) -> str:
+    """Call a QuantJourney API endpoint URL — returns the raw JSON response text.
+
+    The URL is pre-built (Tool.endpoint carries the full URL since manifest
+    parse time). Headers are resolved by the caller (once per tool call) and
+    passed in; this function never touches auth state itself.
+    """
+    resp = _http_post(url, args, headers, 60)
+    resp.raise_for_status()
+    return resp.text
 
 
-def _call_api(path: str, args: Dict[str, Any]) -> Dict[str, Any]:
-    """Call QuantJourney API endpoint."""
-    url = f"{BASE_URL}{path}"
-    resp = requests.post(url, json=args, headers=_get_headers(), timeout=60)
-    resp.raise_for_status()
-    return resp.json()
+# Tool responses pass through verbatim by default; set QJ_MCP_PRETTY=1 to
+# re-indent them for human debugging (costs a full parse + re-serialize).
+_PRETTY = os.getenv("QJ_MCP_PRETTY", "").strip().lower() in ("1", "true", "yes")
+
+
+def _format_tool_result(body: str) -> str:
+    """Format an upstream JSON body for the MCP text content block."""
+    if _PRETTY:
+        try:
+            return _json_dumps_pretty(_json_loads(body))
+        except Exception:
+            pass
+    return body
+
+
+def _tool_content(body: str) -> Dict[str, Any]:
+    """Build the content item for a tool result, compressing large bodies when negotiated."""
+    text = _format_tool_result(body)
+    if _COMPRESSION and len(text) >= _COMPRESS_MIN_BYTES:
+        raw = text.encode("utf-8")
+        if _COMPRESSION == "zstd":
+            packed = zstandard.ZstdCompressor(level=3).compress(raw)
+        else:
+            packed = gzip.compress(raw, compresslevel=6)
+        return {
+            "type": "text",
+            "text": base64.b64encode(packed).decode("ascii"),
+            "encoding": f"{_COMPRESSION}+b64",
+        }
+    return {"type": "text", "text": text}
 
 
 def handle_tools_call(id_val: Any, params: Optional[Dict]) -> Dict[str, Any]:
+    tools = _get_tools()
     raw_name = (params or {}).get("name")
-    name = _unsanitize_tool_name(raw_name) if raw_name else None
+    name = _unsanitize_tool_name(raw_name, tools) if raw_name else None
     arguments = (params or {}).get("arguments") or {}
 
-    if not name or name not in _get_tools():
+    t = tools.get(name) if name else None
+    if t is None:
         return _error(id_val, -32602, f"Unknown tool: {raw_name} (resolved to {name})")
 
-    t = _get_tools()[name]
     try:
-        data = _call_api(t.endpoint, arguments)
-        return _result(id_val, {
-            "content": [{"type": "text", "text": json.dumps(data, indent=2)}],
-        })
-    except requests.HTTPError as exc:
+        body = _call_api(t.endpoint, arguments, _get_headers())
+        return _result(id_val, {"content": [_tool_content(body)]})
+    except _HTTP_ERRORS as exc:
         status = exc.response.status_code if exc.response is not None else 0
         # Token expired mid-session — refresh and retry once
         if status == 401:
             logger.info("Got 401 — refreshing token and retrying")
+            _invalidate_auth()  # locally valid or not, the server rejected it
             _ensure_auth()
             try:
-                data = _call_api(t.endpoint, arguments)
-                return _result(id_val, {
-                    "content": [{"type": "text", "text": json.dumps(data, indent=2)}],
-                })
+                # Rebuild headers with the replacement token
+                body = _call_api(t.endpoint, arguments, _get_headers())
+                return _result(id_val, {"content": [_tool_content(body)]})
             except Exception as retry_exc:
                 return _error(id_val, -32000, "Tool call failed after retry", {"error": str(retry_exc)})
         return _error(id_val, -32000, f"API error: {status}", {"error": str(exc)})
@@ -390,22 +823,47 @@ def handle_tools_call(id_val: Any, params: Optional[Dict]) -> Dict[str, Any]:
         return _error(id_val, -32000, "Tool execution failed", {"error": str(exc)})
 
 
+def process_batch(msgs: List[Any]) -> Optional[Any]:
+    """Process a JSON-RPC batch array — responses are collected and written as one frame.
+
+    Returns a list of responses, a single error for an empty/invalid batch,
+    or None when the batch contained only notifications.
+    """
+    if not msgs:
+        return _error(None, -32600, "Invalid request: empty batch")
+
+    responses: List[Dict[str, Any]] = []
+    for m in msgs:
+        if not isinstance(m, dict):
+            responses.append(_error(None, -32600, "Invalid request in batch"))
+            continue
+        resp = process_message(m)
+        if resp is not None:
+            responses.append(resp)
+    return responses or None
+
+
+# O(1) method → handler dispatch; extend here as the protocol grows
+_DISPATCH = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+}
+
+
 def process_message(msg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Process a single JSON-RPC message and return the response (or None for notifications)."""
     method = msg.get("method")
     id_val = msg.get("id")
     params = msg.get("params")
 
-    if method == "initialize":
-        return handle_initialize(id_val, params)
-    elif method == "tools/list":
-        return handle_tools_list(id_val, params)
-    elif method == "tools/call":
-        return handle_tools_call(id_val, params)
-    elif method == "notifications/initialized":
-        return None  # ACK, no response
-    else:
+    if method == "notifications/initialized":
+        return None  # ACK, no response — nothing to build
+
+    handler = _DISPATCH.get(method)
+    if handler is None:
         return _error(id_val, -32601, f"Method not found: {method}")
+    return handler(id_val, params)
 
 
 # ---------------------------------------------------------------------------
@@ -413,63 +871,186 @@ def process_message(msg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
-def _read_message_stdio(stdin) -> Optional[Dict[str, Any]]:
-    """Read a message from stdin — auto-detects JSONL vs Content-Length format."""
-    first_line = stdin.readline()
+# Reject frames larger than this before they reach the JSON parser — a huge
+# message would otherwise stall every pipelined request behind one parse
+_MAX_FRAME_BYTES = int(os.getenv("QJ_MCP_MAX_FRAME", str(1024 * 1024)))
+
+# Matches an LSP Content-Length header line (bytes, case-insensitive)
+_CL_RE = re.compile(rb"^content-length\s*:\s*(\d+)\s*$", re.IGNORECASE)
+
+
+# Sentinel for a frame that was rejected but left the stream in sync — the
+# read loop skips it and keeps serving. None is reserved for real EOF.
+_SKIPPED = object()
+
+
+def _skip_headers(stdin) -> bool:
+    """Consume remaining LSP header lines up to the blank separator. False on EOF."""
+    while True:
+        line = stdin.readline()
+        if not line:
+            return False
+        if line.strip() == b"":
+            return True
+
+
+def _reject_frame(message: str) -> Any:
+    """Log and answer an unparseable/oversized frame, then keep the session alive."""
+    logger.error("%s — rejecting message", message)
+    _write_message_stdio(_error(None, -32600, message))
+    return _SKIPPED
+
+
+def _read_message_stdio(stdin) -> Optional[Any]:
+    """Read a message (object or batch array) from stdin — auto-detects JSONL vs Content-Length format.
+
+    Framing works on raw bytes throughout — header lines and JSONL lines are
+    never decoded to str; the parser accepts bytes directly. Frames beyond
+    QJ_MCP_MAX_FRAME bytes (default 1 MiB) are rejected with a JSON-RPC
+    error and skipped; returns _SKIPPED for those, None only on EOF.
+    """
+    # Cap the readline so an over-limit line is never fully buffered — the
+    # cap +1 distinguishes "exactly at the limit" from "truncated"
+    first_line = stdin.readline(_MAX_FRAME_BYTES + 1)
     if not first_line:
         return None
 
-    first_str = first_line.decode("utf-8", errors="ignore").strip()
-    if not first_str:
-        return None
+    if len(first_line) > _MAX_FRAME_BYTES:
+        # Truncated at the cap — drain to the next newline in bounded chunks
+        # so the stream stays in sync, then reject
+        tail = first_line
+        while not tail.endswith(b"\n"):
+            tail = stdin.readline(65536)
+            if not tail:
+                return None
+        return _reject_frame(f"Message exceeds {_MAX_FRAME_BYTES} bytes")
+
+    stripped = first_line.strip()
+    if not stripped:
+        return _SKIPPED  # blank line between frames — nothing to parse
 
     # Content-Length header → LSP-style framing
-    if first_str.lower().startswith("content-length:"):
-        length = int(first_str.split(":", 1)[1].strip())
-        # Skip remaining headers until empty line
-        while True:
-            line = stdin.readline()
-            if not line:
+    cl_match = _CL_RE.match(stripped)
+    if cl_match:
+        length = int(cl_match.group(1))
+        if length > _MAX_FRAME_BYTES:
+            # The frame length is declared, so drain exactly that many bytes
+            # and stay in sync for the next frame
+            if not _skip_headers(stdin):
                 return None
-            if line.strip() == b"":
-                break
-        body = stdin.read(length)
-        if not body:
+            remaining = length
+            while remaining > 0:
+                chunk = stdin.read(min(remaining, 65536))
+                if not chunk:
+                    return None
+                remaining -= len(chunk)
+            return _reject_frame(f"Content-Length {length} exceeds {_MAX_FRAME_BYTES} bytes")
+        if not _skip_headers(stdin):
             return None
+        # Read exactly `length` bytes — a pipe read may come back short.
+        # readinto fills the one pre-sized buffer directly, so a large frame
+        # never exists as a second intermediate bytes object.
+        body = bytearray(length)
+        view = memoryview(body)
+        pos = 0
+        while pos < length:
+            n = stdin.readinto(view[pos:])
+            if not n:
+                return None
+            pos += n
         try:
-            return json.loads(body.decode("utf-8", errors="ignore"))
+            msg = _json_loads(body)
         except Exception as exc:
-            logger.error("JSON parse error (LSP): %s", exc)
-            return None
+            return _reject_frame(f"JSON parse error (LSP): {exc}")
     else:
-        # JSONL — the line IS the JSON message
+        # JSONL — the line IS the JSON message (already size-gated above)
         try:
-            return json.loads(first_str)
+            msg = _json_loads(stripped)
         except Exception as exc:
-            logger.error("JSON parse error (JSONL): %s", exc)
-            return None
+            return _reject_frame(f"JSON parse error (JSONL): {exc}")
+    if msg is None:
+        # A JSON null parses to None, which would masquerade as EOF upstream
+        return _reject_frame("Invalid request: null")
+    return msg
+
 
+# Serializes stdout writes so concurrent workers can't interleave frames
+_WRITE_LOCK = threading.Lock()
 
-def _write_message_stdio(msg: Dict[str, Any]) -> None:
-    """Write message to stdout in JSONL format (newline-terminated)."""
-    data = json.dumps(msg, separators=(",", ":"))
-    sys.stdout.write(data + "\n")
-    sys.stdout.flush()
+# Number of concurrent tool-call workers
+_MAX_WORKERS = max(1, int(os.getenv("QJ_MCP_WORKERS", "8")))
+
+
+def _write_message_stdio(msg: Any) -> None:
+    """Write a message (or batch response array) to stdout in JSONL format (newline-terminated)."""
+    data = _json_dumps(msg) + b"\n"
+    with _WRITE_LOCK:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+
+def _handle_and_write(msg: Dict[str, Any]) -> None:
+    """Worker-pool entry: process one message and write its response."""
+    try:
+        resp = process_message(msg)
+    except Exception as exc:
+        logger.error("Worker failed: %s", exc)
+        resp = _error(msg.get("id"), -32603, "Internal error", {"error": str(exc)})
+    if resp is not None:
+        _write_message_stdio(resp)
 
 
 def run_stdio() -> int:
-    """Main stdio loop — reads JSON-RPC messages and writes responses."""
+    """Main stdio loop — reads JSON-RPC messages and writes responses.
+
+    tools/call requests are dispatched to a small worker pool so one slow
+    API round trip doesn't stall the read loop (or other pipelined calls);
+    everything else is answered inline to keep the handshake ordered.
+    """
     logger.info("Server ready (stdio mode)")
-    stdin = sys.stdin.buffer
-    while True:
-        msg = _read_message_stdio(stdin)
-        if msg is None:
-            logger.info("No more messages — exiting")
-            break
-        logger.debug("Received: %s", msg.get("method", "unknown"))
-        resp = process_message(msg)
-        if resp is not None:
-            _write_message_stdio(resp)
+    try:
+        # Re-buffer stdin at 64 KB — the default pipe buffer forces extra
+        # reads per large Content-Length frame. Nothing has read from the
+        # default buffer yet, so rewrapping the raw stream is safe here.
+        stdin = io.BufferedReader(sys.stdin.buffer.raw, buffer_size=65536)
+    except (AttributeError, io.UnsupportedOperation):
+        stdin = sys.stdin.buffer  # non-standard stdin (e.g. tests) — use as-is
+    pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="qj-tool")
+    try:
+        while True:
+            msg = _read_message_stdio(stdin)
+            if msg is None:
+                logger.info("No more messages — exiting")
+                break
+            if msg is _SKIPPED:
+                continue  # rejected frame already answered; keep serving
+            try:
+                if isinstance(msg, list):
+                    # JSON-RPC batch — answer all requests in a single stdout write
+                    logger.debug("Received batch of %d messages", len(msg))
+                    resp = process_batch(msg)
+                elif not isinstance(msg, dict):
+                    # Valid JSON but not a request object (e.g. a bare number)
+                    # — same guard process_batch applies per item
+                    resp = _error(None, -32600, "Invalid request: expected object")
+                elif msg.get("method") == "tools/call":
+                    logger.debug("Received: tools/call (dispatching to worker)")
+                    pool.submit(_handle_and_write, msg)
+                    continue
+                else:
+                    logger.debug("Received: %s", msg.get("method", "unknown"))
+                    resp = process_message(msg)
+            except Exception as exc:
+                # Same guard the worker path has — one bad message must not
+                # take down the read loop
+                logger.error("Handler failed: %s", exc)
+                id_val = msg.get("id") if isinstance(msg, dict) else None
+                resp = _error(id_val, -32603, "Internal error", {"error": str(exc)})
+            if resp is not None:
+                _write_message_stdio(resp)
+    finally:
+        # Flush in-flight tool calls before exiting
+        pool.shutdown(wait=True)
     return 0
 
 
@@ -485,8 +1066,15 @@ def main() -> int:
     logger.info("QuantJourney MCP Server v1.1.0")
     logger.info("API: %s", BASE_URL)
 
-    # Auth happens lazily on first API call (via _ensure_auth)
-    # This avoids blocking stdio during Claude Desktop startup
+    # Reuse tokens from the last run when still valid — a restart then costs
+    # zero auth round trips before the first tool call
+    _load_auth_state()
+
+    # Warm auth + manifest while the client runs its initialize handshake, so
+    # the first tools/list usually answers from memory. stdio starts
+    # immediately either way, and failures fall back to lazy loading.
+    threading.Thread(target=_prefetch_tools, daemon=True).start()
+
     return run_stdio()
 
 